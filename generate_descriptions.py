@@ -4,10 +4,13 @@ import argparse
 import base64
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Iterable
 
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
+
+from run_metrics import RunMetrics, ratio
 
 EXAMPLE_JSON = {
     "name": "CommandPost_01_PropsC",
@@ -87,6 +90,11 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         action="store_true",
         help="Skip items that already have a description field.",
     )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write run metrics to <metrics>.json and <metrics>.prom (Prometheus text format).",
+    )
     return parser.parse_args(argv)
 
 
@@ -163,6 +171,7 @@ def generate_description(
 
     Returns a tuple of (description text or None, usage_info dict).
     usage_info contains: cost (float), prompt_tokens (int), completion_tokens (int), total_tokens (int)
+    and, once a request was sent, api_seconds (float)
     """
     if not thumbnail_path.exists():
         print(f"  Warning: Thumbnail not found at {thumbnail_path}")
@@ -179,6 +188,7 @@ def generate_description(
     prompt = build_prompt(asset_data)
 
     # Make API request using OpenAI client
+    request_started = time.perf_counter()
     try:
         # Build example context with JSON
         example_output = {
@@ -251,6 +261,7 @@ def generate_description(
                 }
             ],
         )
+        api_seconds = time.perf_counter() - request_started
 
         # Extract and parse JSON response
         response_text = response.choices[0].message.content.strip()
@@ -281,7 +292,8 @@ def generate_description(
             "cost": 0.0,
             "prompt_tokens": 0,
             "completion_tokens": 0,
-            "total_tokens": 0
+            "total_tokens": 0,
+            "api_seconds": api_seconds,
         }
 
         if hasattr(response, 'usage') and response.usage:
@@ -303,7 +315,13 @@ def generate_description(
 
     except Exception as exc:
         print(f"  API request failed: {exc}")
-        return None, {"cost": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        return None, {
+            "cost": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "api_seconds": time.perf_counter() - request_started,
+        }
 
 
 def main(argv: Iterable[str] | None = None) -> None:
@@ -333,10 +351,18 @@ def main(argv: Iterable[str] | None = None) -> None:
             "OpenRouter API key required. Provide via --api-key or OPENROUTER_API_KEY env var."
         )
 
+    # Count every HTTP attempt, including the client's automatic retries, so
+    # retries can be reported for failed requests as well as successful ones
+    http_attempts = {"count": 0}
+
+    def count_attempt(request) -> None:
+        http_attempts["count"] += 1
+
     # Initialize OpenAI client configured for OpenRouter
     client = OpenAI(
         base_url="https://openrouter.ai/api/v1",
         api_key=api_key,
+        http_client=DefaultHttpxClient(event_hooks={"request": [count_attempt]}),
     )
 
     # Load stats JSON
@@ -350,6 +376,8 @@ def main(argv: Iterable[str] | None = None) -> None:
     print(f"Loaded {len(stats_data)} assets")
     print(f"Using model: {args.model}")
 
+    metrics = RunMetrics("generate_descriptions")
+
     # Process each asset
     processed_count = 0
     skipped_count = 0
@@ -358,6 +386,7 @@ def main(argv: Iterable[str] | None = None) -> None:
     total_prompt_tokens = 0
     total_completion_tokens = 0
     total_tokens = 0
+    successful_api_seconds = 0.0
 
     for index, asset_data in enumerate(stats_data, start=1):
         asset_name = asset_data.get("name", f"unknown_{index}")
@@ -373,6 +402,7 @@ def main(argv: Iterable[str] | None = None) -> None:
         thumbnail_path = thumbnails_directory / f"{asset_name}.png"
 
         # Generate description
+        attempts_before = http_attempts["count"]
         description, usage_info = generate_description(
             asset_data,
             thumbnail_path,
@@ -380,6 +410,20 @@ def main(argv: Iterable[str] | None = None) -> None:
             args.model,
         )
 
+        if "api_seconds" in usage_info:
+            metrics.inc("api_requests_total", help_text="Vision API requests sent.")
+            metrics.observe_summary(
+                "api_latency_seconds", usage_info["api_seconds"], help_text="Vision API request latency."
+            )
+            attempts = http_attempts["count"] - attempts_before
+            metrics.inc(
+                "api_retries_total", max(attempts - 1, 0), help_text="Automatic API retries."
+            )
+            if description:
+                successful_api_seconds += usage_info["api_seconds"]
+            else:
+                metrics.inc("api_failures_total", help_text="Vision API requests that failed.")
+
         if description:
             asset_data["description"] = description
             # Add keywords to asset data
@@ -431,6 +475,30 @@ def main(argv: Iterable[str] | None = None) -> None:
     print(f"  Total cost: ${total_cost:.6f}")
     print(f"  Average cost per item: ${avg_cost:.6f}")
 
+    if args.metrics:
+        metrics.inc("items_processed_total", processed_count, help_text="Assets described.")
+        metrics.inc("items_skipped_total", skipped_count, help_text="Assets skipped.")
+        metrics.inc("items_failed_total", failed_count, help_text="Assets that failed.")
+        metrics.inc("prompt_tokens_total", total_prompt_tokens, help_text="Prompt tokens used.")
+        metrics.inc(
+            "completion_tokens_total", total_completion_tokens, help_text="Completion tokens used."
+        )
+        metrics.inc("cost_dollars_total", total_cost, help_text="Total API cost in USD.")
+        metrics.finish()
+        metrics.set(
+            "items_per_second",
+            ratio(processed_count, metrics.gauges["run_duration_seconds"]),
+            "Assets described per second.",
+        )
+        metrics.set(
+            "completion_tokens_per_second",
+            ratio(total_completion_tokens, successful_api_seconds),
+            "Completion tokens generated per second of successful API time.",
+        )
+        metrics.set("cost_per_item_dollars", avg_cost, "Average API cost per described asset.")
+        json_path, prom_path = metrics.write(args.metrics.expanduser().resolve())
+        print(f"\nWrote run metrics to {json_path} and {prom_path}")
+
 
 if __name__ == "__main__":
     main(sys.argv[1:])
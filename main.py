@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
+import io
 import json
 import math
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import trimesh
 
+from run_metrics import RunMetrics, ratio
+
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+NORMALIZED_FIELDS = ("levelRestrictions", "category")
+ASSET_TYPES_CACHE_VERSION = 2
+
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -33,41 +47,313 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         type=Path,
         help="Path to the asset_types.json file with additional metadata.",
     )
+    parser.add_argument(
+        "--no-asset-cache",
+        action="store_true",
+        help="Always re-parse asset_types.json instead of using its .cache file.",
+    )
+    parser.add_argument(
+        "--prefetch-workers",
+        type=int,
+        default=0,
+        help=(
+            "Number of reader threads that load upcoming GLB files into memory while "
+            "the current one is analysed. Defaults to 0 (read each file on demand)."
+        ),
+    )
+    parser.add_argument(
+        "--prefetch-mb",
+        type=float,
+        default=256.0,
+        help="Maximum megabytes of GLB data held in memory by --prefetch-workers.",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write run metrics to <metrics>.json and <metrics>.prom (Prometheus text format).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Also write a minified <output>.min.json next to the main output.",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSION_SUFFIXES,
+        help="Also write a compressed, minified copy of each artifact (gzip or zstd).",
+    )
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help=(
+            "Also write <output>.normalized.json where level restrictions and "
+            "categories are stored once and referenced by id."
+        ),
+    )
     return parser.parse_args(argv)
 
 
-def load_asset_types(path: Path) -> dict[str, dict]:
-    """Load and parse asset_types.json file into a dictionary keyed by model name."""
+def build_asset_info(asset: dict) -> dict | None:
+    """Convert one AssetTypes entry into the metadata merged into the stats."""
+    model_name = asset.get("type")
+    if not model_name:
+        return None
+
+    # Extract constants into a dict for easier lookup
+    constants = {}
+    for constant in asset.get("constants", []):
+        constants[constant["name"]] = constant["value"]
+
+    return {
+        "name": model_name,
+        "path": asset.get("directory", ""),
+        "physicsCost": constants.get("physicsCost"),
+        "category": constants.get("category"),
+        "levelRestrictions": asset.get("levelRestrictions", []),
+    }
+
+
+_JSON_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _JsonStream:
+    """Minimal incremental reader that decodes one JSON value at a time from a file."""
+
+    def __init__(self, handle, chunk_size: int) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer only ever holds unread data
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in asset types JSON, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more data as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off at the buffer edge may continue in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in _JSON_NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_asset_types(path: Path, *, chunk_size: int = 1 << 20) -> Iterator[dict]:
+    """
+    Yield entries of the top-level "AssetTypes" array one at a time, so peak
+    memory stays bounded by a single entry rather than the whole file.
+    """
     with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "AssetTypes" and stream.peek() == "[":
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.pos += 1
+                else:
+                    while True:
+                        yield stream.value()
+                        if stream.peek() == "]":
+                            stream.pos += 1
+                            break
+                        stream.expect(",")
+            else:
+                stream.value()
+            if stream.peek() == "}":
+                return
+            stream.expect(",")
 
-    asset_map = {}
-    for asset in data.get("AssetTypes", []):
-        model_name = asset.get("type")
-        if not model_name:
-            continue
-
-        # Extract constants into a dict for easier lookup
-        constants = {}
-        for constant in asset.get("constants", []):
-            constants[constant["name"]] = constant["value"]
-
-        # Build the asset metadata
-        asset_info = {
-            "name": model_name,
-            "path": asset.get("directory", ""),
-            "physicsCost": constants.get("physicsCost"),
-            "category": constants.get("category"),
-            "levelRestrictions": asset.get("levelRestrictions", []),
-        }
 
-        asset_map[model_name] = asset_info
+def hash_file(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def asset_types_cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache")
+
+
+def read_asset_types_cache(cache_path: Path, source_hash: str) -> dict[str, dict] | None:
+    """Return the cached asset map if it was built from the same source, else None."""
+    try:
+        with cache_path.open("rb") as f:
+            cached = json.loads(f.read())
+    except Exception:
+        # Best-effort cache: anything unreadable is treated as a miss
+        return None
+    if not isinstance(cached, dict):
+        return None
+    if cached.get("version") != ASSET_TYPES_CACHE_VERSION:
+        return None
+    if cached.get("source_hash") != source_hash:
+        return None
+    asset_map = cached.get("asset_map")
+    return asset_map if isinstance(asset_map, dict) else None
+
+
+def write_asset_types_cache(cache_path: Path, source_hash: str, asset_map: dict[str, dict]) -> None:
+    payload = {
+        "version": ASSET_TYPES_CACHE_VERSION,
+        "source_hash": source_hash,
+        "asset_map": asset_map,
+    }
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(encode_json(payload, compact=True))
+        tmp_path.replace(cache_path)
+    except OSError:
+        # The cache is only an optimisation; a read-only SDK folder is fine
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_asset_types(
+    path: Path, *, use_cache: bool = True, metrics: RunMetrics | None = None
+) -> dict[str, dict]:
+    """
+    Load and parse asset_types.json file into a dictionary keyed by model name.
+
+    The parsed map is cached next to the source file, keyed by the source's
+    SHA-256, so unchanged files are loaded with a single read on later runs.
+    """
+    if use_cache:
+        source_hash = hash_file(path)
+        cache_path = asset_types_cache_path(path)
+        cached = read_asset_types_cache(cache_path, source_hash)
+        if metrics is not None:
+            outcome = "hits" if cached is not None else "misses"
+            metrics.inc(f"asset_types_cache_{outcome}_total", help_text="Asset types cache lookups.")
+        if cached is not None:
+            return cached
+
+    asset_map = {}
+    for asset in iter_asset_types(path):
+        asset_info = build_asset_info(asset)
+        if asset_info is not None:
+            asset_map[asset_info["name"]] = asset_info
 
+    if use_cache:
+        write_asset_types_cache(cache_path, source_hash, asset_map)
     return asset_map
 
 
-def load_scene(path: Path) -> trimesh.Scene:
-    scene = trimesh.load(path, force="scene")
+def prefetch_files(
+    paths: Iterable[Path], *, workers: int, max_bytes: int
+) -> Iterator[tuple[Path, Future[tuple[bytes, float]]]]:
+    """
+    Yield (path, future) pairs in order while a thread pool reads the following
+    files' bytes ahead of time. Each future resolves to (data, read_seconds). Reader threads admit files strictly in order and
+    only while the bytes held by the current and prefetched files stay within
+    max_bytes; a single file larger than the budget is still read on its own.
+
+    All file access happens on the reader threads, so a missing or unreadable
+    file surfaces from that file's future. Consumers must call result() on each
+    future before advancing, which is when its bytes leave the budget and the
+    generator drops its reference to them.
+    """
+    paths = list(paths)
+    budget = threading.Condition()
+    state = {"turn": 0, "held": 0, "closed": False}
+    admitted: dict[int, int] = {}
+
+    def read(index: int, path: Path) -> tuple[bytes, float]:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            # read_bytes below raises the real error for this file
+            size = 0
+
+        def may_start() -> bool:
+            if state["closed"]:
+                return True
+            if state["turn"] != index:
+                return False
+            return state["held"] == 0 or state["held"] + size <= max_bytes
+
+        with budget:
+            budget.wait_for(may_start)
+            if state["closed"]:
+                raise CancelledError()
+            state["turn"] += 1
+            state["held"] += size
+            admitted[index] = size
+            budget.notify_all()
+        read_started = time.perf_counter()
+        data = path.read_bytes()
+        return data, time.perf_counter() - read_started
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="glb-reader")
+    try:
+        pending = deque(
+            (index, path, pool.submit(read, index, path)) for index, path in enumerate(paths)
+        )
+        while pending:
+            # Pop before yielding so a finished future (and its bytes) is not
+            # kept alive once the consumer moves on
+            index, path, future = pending.popleft()
+            yield path, future
+            del future
+            # The consumer has finished with this file, so its bytes leave the budget
+            with budget:
+                state["held"] -= admitted.pop(index, 0)
+                budget.notify_all()
+    finally:
+        # Wake readers waiting on the budget and drop queued reads so an early
+        # exit does not block on the remaining files
+        with budget:
+            state["closed"] = True
+            budget.notify_all()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def load_scene(path: Path, data: bytes | None = None) -> trimesh.Scene:
+    if data is None:
+        scene = trimesh.load(path, force="scene")
+    else:
+        file_type = path.suffix.lstrip(".").lower()
+        scene = trimesh.load(io.BytesIO(data), file_type=file_type, force="scene")
     if not isinstance(scene, trimesh.Scene):
         scene = trimesh.Scene(scene)
     if not scene.geometry:
@@ -174,8 +460,10 @@ def detect_mesh_validity_issues(scene: trimesh.Scene, bbox_volume: float) -> dic
     }
 
 
-def collect_stats(path: Path, asset_metadata: dict | None = None) -> dict:
-    scene = load_scene(path)
+def collect_stats(
+    path: Path, asset_metadata: dict | None = None, data: bytes | None = None
+) -> dict:
+    scene = load_scene(path, data)
     bounds = scene.bounds
     if bounds is None:
         raise ValueError(f"Unable to compute bounds for: {path}")
@@ -244,6 +532,133 @@ def collect_stats(path: Path, asset_metadata: dict | None = None) -> dict:
     return result
 
 
+def normalize_results(results: list[dict]) -> dict:
+    """
+    Store each distinct levelRestrictions list and category once and replace
+    the per-item values with an index into the matching lookup table.
+    """
+    tables: dict[str, list] = {field: [] for field in NORMALIZED_FIELDS}
+    ids: dict[str, dict] = {field: {} for field in NORMALIZED_FIELDS}
+
+    items = []
+    for stats in results:
+        item = dict(stats)
+        for field in NORMALIZED_FIELDS:
+            if field not in item:
+                continue
+            value = item[field]
+            key = tuple(value) if isinstance(value, list) else value
+            if key not in ids[field]:
+                ids[field][key] = len(tables[field])
+                tables[field].append(value)
+            item[field] = ids[field][key]
+        items.append(item)
+
+    return {"tables": tables, "items": items}
+
+
+def expand_results(normalized: dict) -> list[dict]:
+    """Rebuild the plain list of stats from the output of normalize_results."""
+    tables = normalized["tables"]
+    results = []
+    for item in normalized["items"]:
+        stats = dict(item)
+        for field in NORMALIZED_FIELDS:
+            if field in stats:
+                value = tables[field][stats[field]]
+                stats[field] = list(value) if isinstance(value, list) else value
+        results.append(stats)
+    return results
+
+
+def encode_json(data: object, *, compact: bool) -> bytes:
+    if compact:
+        text = json.dumps(data, separators=(",", ":"))
+    else:
+        text = json.dumps(data, indent=2)
+    return text.encode("utf-8")
+
+
+def compress_bytes(payload: bytes, method: str) -> bytes:
+    if method == "gzip":
+        # mtime=0 keeps the artifact byte-for-byte reproducible between runs
+        return gzip.compress(payload, compresslevel=9, mtime=0)
+    if method == "zstd":
+        return _zstandard().ZstdCompressor(level=19).compress(payload)
+    raise ValueError(f"Unknown compression method: {method}")
+
+
+def decompress_bytes(payload: bytes, method: str) -> bytes:
+    if method == "gzip":
+        return gzip.decompress(payload)
+    if method == "zstd":
+        return _zstandard().ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unknown compression method: {method}")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise SystemExit(
+            "zstd compression requires the 'zstandard' package (uv sync --extra zstd)"
+        ) from exc
+    return zstandard
+
+
+def verify_round_trip(results: list[dict], path: Path, compression: str | None = None) -> None:
+    """
+    Read an artifact back from disk and check it expands to exactly the original
+    results, deleting it if it does not.
+    """
+    payload = path.read_bytes()
+    if compression:
+        payload = decompress_bytes(payload, compression)
+    data = json.loads(payload.decode("utf-8"))
+    if isinstance(data, dict):
+        data = expand_results(data)
+    # Compare encodings rather than objects so NaN values (NaN != NaN) still match
+    if encode_json(data, compact=True) != encode_json(results, compact=True):
+        path.unlink(missing_ok=True)
+        raise ValueError(f"Round-trip check failed for {path}")
+
+
+def write_artifacts(
+    results: list[dict],
+    output_path: Path,
+    *,
+    compact: bool = False,
+    compression: str | None = None,
+    normalize: bool = False,
+) -> list[Path]:
+    """
+    Write the optional release artifacts next to output_path and verify each one
+    round-trips to the original results. Returns the paths that were written.
+    """
+    # Each variant is (path, data, whether to write the uncompressed file)
+    variants: list[tuple[Path, object, bool]] = []
+    if compact or compression:
+        variants.append((output_path.with_suffix(".min.json"), results, compact))
+    if normalize:
+        variants.append(
+            (output_path.with_suffix(".normalized.json"), normalize_results(results), True)
+        )
+
+    written = []
+    for path, data, write_plain in variants:
+        payload = encode_json(data, compact=True)
+        if write_plain:
+            path.write_bytes(payload)
+            verify_round_trip(results, path)
+            written.append(path)
+        if compression:
+            compressed_path = path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+            compressed_path.write_bytes(compress_bytes(payload, compression))
+            verify_round_trip(results, compressed_path, compression)
+            written.append(compressed_path)
+    return written
+
+
 def render_progress(current: int, total: int, name: str, *, bar_length: int = 30) -> None:
     if total <= 0:
         total = 1
@@ -256,6 +671,29 @@ def render_progress(current: int, total: int, name: str, *, bar_length: int = 30
     sys.stdout.flush()
 
 
+def write_run_metrics(metrics: RunMetrics, path: Path) -> None:
+    """Add the derived throughput and hit-rate gauges and write both metrics files."""
+    metrics.finish()
+    duration = metrics.gauges["run_duration_seconds"]
+    counters = metrics.counters
+    metrics.set(
+        "files_per_second",
+        ratio(counters.get("files_processed_total", 0), duration),
+        "GLB files analysed per second.",
+    )
+    metrics.set(
+        "bytes_per_second",
+        ratio(counters.get("bytes_read_total", 0), duration),
+        "GLB bytes read per second.",
+    )
+    for name in ("asset_types_cache", "asset_metadata"):
+        hits = counters.get(f"{name}_hits_total", 0)
+        misses = counters.get(f"{name}_misses_total", 0)
+        metrics.set(f"{name}_hit_ratio", ratio(hits, hits + misses), f"Hit rate of {name} lookups.")
+    json_path, prom_path = metrics.write(path)
+    print(f"Wrote run metrics to {json_path} and {prom_path}")
+
+
 def main(argv: Iterable[str] | None = None) -> None:
     args = parse_args(argv)
 
@@ -269,6 +707,12 @@ def main(argv: Iterable[str] | None = None) -> None:
     output_path = output_path.expanduser().resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Fail before the (slow) analysis rather than when writing the artifacts
+    if args.compress == "zstd":
+        _zstandard()
+
+    metrics = RunMetrics("prop_stats")
+
     # Load asset types if provided
     asset_map = {}
     if args.asset_types:
@@ -276,7 +720,9 @@ def main(argv: Iterable[str] | None = None) -> None:
         if not asset_types_path.is_file():
             raise SystemExit(f"Asset types file not found: {asset_types_path}")
         try:
-            asset_map = load_asset_types(asset_types_path)
+            asset_map = load_asset_types(
+                asset_types_path, use_cache=not args.no_asset_cache, metrics=metrics
+            )
             print(f"Loaded {len(asset_map)} asset types from {asset_types_path}")
         except Exception as exc:
             raise SystemExit(f"Failed to load asset types: {exc}") from exc
@@ -288,18 +734,69 @@ def main(argv: Iterable[str] | None = None) -> None:
     if not glb_files:
         raise SystemExit(f"No .glb files found in: {directory}")
 
+    if args.prefetch_workers < 0:
+        raise SystemExit("--prefetch-workers must not be negative")
+    if args.prefetch_mb <= 0:
+        raise SystemExit("--prefetch-mb must be positive")
+
+    if args.prefetch_workers > 0:
+        sources = prefetch_files(
+            glb_files,
+            workers=args.prefetch_workers,
+            max_bytes=int(args.prefetch_mb * 1024 * 1024),
+        )
+    else:
+        sources = ((path, None) for path in glb_files)
+
     results = []
     total_files = len(glb_files)
-    for index, glb_path in enumerate(glb_files, start=1):
-        try:
-            # Look up asset metadata by the GLB filename (without extension)
-            asset_metadata = asset_map.get(glb_path.stem)
-            stats = collect_stats(glb_path, asset_metadata)
-        except Exception as exc:  # pragma: no cover - surfaces errors to the caller
-            sys.stdout.write("\n")
-            raise SystemExit(f"Failed to process {glb_path.name}: {exc}") from exc
-        results.append(stats)
-        render_progress(index, total_files, glb_path.name)
+    try:
+        for index, (glb_path, prefetched) in enumerate(sources, start=1):
+            try:
+                # Both modes analyse an in-memory buffer, so file_duration_seconds
+                # covers the same work with or without --prefetch-workers
+                if prefetched is not None:
+                    wait_started = time.perf_counter()
+                    data, read_seconds = prefetched.result()
+                    # Drop the future so only `data` keeps this file's bytes alive
+                    prefetched = None
+                    metrics.inc(
+                        "prefetch_wait_seconds_total",
+                        time.perf_counter() - wait_started,
+                        help_text="Time spent waiting on reader threads.",
+                    )
+                else:
+                    read_started = time.perf_counter()
+                    data = glb_path.read_bytes()
+                    read_seconds = time.perf_counter() - read_started
+                # Look up asset metadata by the GLB filename (without extension)
+                asset_metadata = asset_map.get(glb_path.stem)
+                file_started = time.perf_counter()
+                stats = collect_stats(glb_path, asset_metadata, data)
+                file_seconds = time.perf_counter() - file_started
+                bytes_read = len(data)
+                del data
+            except Exception as exc:  # pragma: no cover - surfaces errors to the caller
+                sys.stdout.write("\n")
+                raise SystemExit(f"Failed to process {glb_path.name}: {exc}") from exc
+            results.append(stats)
+            metrics.inc("files_processed_total", help_text="GLB files analysed.")
+            metrics.inc("bytes_read_total", bytes_read, help_text="Bytes of GLB data read.")
+            metrics.observe(
+                "file_read_seconds", read_seconds, help_text="Per-file time reading GLB bytes."
+            )
+            metrics.observe(
+                "file_duration_seconds",
+                file_seconds,
+                help_text="Per-file analysis latency of an in-memory GLB, excluding the read.",
+            )
+            if asset_map:
+                outcome = "hits" if asset_metadata else "misses"
+                metrics.inc(f"asset_metadata_{outcome}_total", help_text="Asset metadata lookups.")
+            render_progress(index, total_files, glb_path.name)
+    finally:
+        # Stop any read-ahead still in flight when a file fails
+        sources.close()
 
     sys.stdout.write("\n")
     with output_path.open("w", encoding="utf-8") as outfile:
@@ -307,6 +804,22 @@ def main(argv: Iterable[str] | None = None) -> None:
 
     print(f"Wrote statistics for {len(results)} file(s) to {output_path}")
 
+    try:
+        artifacts = write_artifacts(
+            results,
+            output_path,
+            compact=args.compact,
+            compression=args.compress,
+            normalize=args.normalize,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"Failed to write release artifacts: {exc}") from exc
+    for artifact_path in artifacts:
+        print(f"Wrote {artifact_path.name} ({artifact_path.stat().st_size:,} bytes)")
+
+    if args.metrics:
+        write_run_metrics(metrics, args.metrics.expanduser().resolve())
+
 
 if __name__ == "__main__":
     main(sys.argv[1:])
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+# Latency buckets in seconds, shared by every histogram
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _windows_peak_rss_bytes() -> int | None:
+    """Peak working set size from GetProcessMemoryInfo."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    # K32GetProcessMemoryInfo is the kernel32 export of psapi's GetProcessMemoryInfo
+    get_info = kernel32.K32GetProcessMemoryInfo
+    get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    get_info.restype = wintypes.BOOL
+    if not get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return int(counters.PeakWorkingSetSize)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where it is unavailable."""
+    if sys.platform == "win32":
+        try:
+            return _windows_peak_rss_bytes()
+        except (OSError, AttributeError):  # pragma: no cover - very old Windows
+            return None
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - other platforms without resource
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def quantile(values: list[float], q: float) -> float | None:
+    """Linear-interpolated quantile of values, or None when there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+class RunMetrics:
+    """
+    Collect counters, gauges, histograms and summaries for a single run and
+    export them as JSON or in the Prometheus text-exposition format.
+    """
+
+    def __init__(self, job: str) -> None:
+        self.job = job
+        self.started = time.perf_counter()
+        self.help: dict[str, str] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float | None] = {}
+        self.histograms: dict[str, list[float]] = {}
+        self.summaries: dict[str, list[float]] = {}
+
+    def _describe(self, name: str, help_text: str | None) -> None:
+        if help_text and name not in self.help:
+            self.help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, help_text: str | None = None) -> None:
+        self._describe(name, help_text)
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float | None, help_text: str | None = None) -> None:
+        self._describe(name, help_text)
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float, help_text: str | None = None) -> None:
+        """Record a value in a bucketed histogram."""
+        self._describe(name, help_text)
+        self.histograms.setdefault(name, []).append(value)
+
+    def observe_summary(self, name: str, value: float, help_text: str | None = None) -> None:
+        """Record a value in a summary reported as quantiles."""
+        self._describe(name, help_text)
+        self.summaries.setdefault(name, []).append(value)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def finish(self) -> None:
+        """Record the run duration and peak RSS; call once before exporting."""
+        self.set("run_duration_seconds", self.elapsed(), "Wall-clock duration of the run.")
+        self.set("peak_rss_bytes", peak_rss_bytes(), "Peak resident set size of the process.")
+
+    def to_dict(self) -> dict:
+        histograms = {}
+        for name, values in self.histograms.items():
+            histograms[name] = {
+                "count": len(values),
+                "sum": sum(values),
+                "buckets": {
+                    str(bound): sum(1 for value in values if value <= bound)
+                    for bound in DEFAULT_BUCKETS
+                },
+            }
+        summaries = {}
+        for name, values in self.summaries.items():
+            summaries[name] = {
+                "count": len(values),
+                "sum": sum(values),
+                "min": min(values) if values else None,
+                "max": max(values) if values else None,
+                **{f"p{round(q * 100)}": quantile(values, q) for q in SUMMARY_QUANTILES},
+            }
+        return {
+            "job": self.job,
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": histograms,
+            "summaries": summaries,
+        }
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        prefix = f"{self.job}_"
+
+        def header(name: str, kind: str) -> str:
+            metric = prefix + name
+            if name in self.help:
+                lines.append(f"# HELP {metric} {self.help[name]}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        for name, value in self.counters.items():
+            metric = header(name, "counter")
+            lines.append(f"{metric} {_format_value(value)}")
+        for name, value in self.gauges.items():
+            if value is None:
+                continue
+            metric = header(name, "gauge")
+            lines.append(f"{metric} {_format_value(value)}")
+        for name, values in self.histograms.items():
+            metric = header(name, "histogram")
+            for bound in DEFAULT_BUCKETS:
+                count = sum(1 for value in values if value <= bound)
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {len(values)}')
+            lines.append(f"{metric}_sum {_format_value(sum(values))}")
+            lines.append(f"{metric}_count {len(values)}")
+        for name, values in self.summaries.items():
+            metric = header(name, "summary")
+            for q in SUMMARY_QUANTILES:
+                value = quantile(values, q)
+                if value is not None:
+                    lines.append(f'{metric}{{quantile="{q}"}} {_format_value(value)}')
+            lines.append(f"{metric}_sum {_format_value(sum(values))}")
+            lines.append(f"{metric}_count {len(values)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> tuple[Path, Path]:
+        """Write <path>.json and <path>.prom and return both paths."""
+        json_path = path.with_suffix(".json")
+        prom_path = path.with_suffix(".prom")
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with json_path.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with prom_path.open("w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        return json_path, prom_path
+
+
+def ratio(numerator: float, denominator: float) -> float | None:
+    return numerator / denominator if denominator else None
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class TrackedBytes(bytes):
+    """bytes that record when they are freed (bytes cannot be weakly referenced)."""
+
+    freed: set[str] = set()
+
+    def __new__(cls, data: bytes, name: str) -> TrackedBytes:
+        obj = super().__new__(cls, data)
+        obj.name = name
+        return obj
+
+    def __del__(self) -> None:
+        TrackedBytes.freed.add(self.name)
+
+
+class PrefetchFilesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        directory = Path(self.tmp.name)
+        self.paths = []
+        for index in range(20):
+            path = directory / f"prop_{index:02}.glb"
+            path.write_bytes(bytes([index]) * 1024)
+            self.paths.append(path)
+
+    def test_yields_files_in_order(self) -> None:
+        seen = []
+        for path, future in main.prefetch_files(self.paths, workers=4, max_bytes=4096):
+            data, _ = future.result()
+            self.assertEqual(data, path.read_bytes())
+            seen.append(path)
+        self.assertEqual(seen, self.paths)
+
+    def test_consumed_buffers_become_unreachable(self) -> None:
+        TrackedBytes.freed.clear()
+        original_read_bytes = Path.read_bytes
+
+        def tracked_read_bytes(path: Path) -> bytes:
+            return TrackedBytes(original_read_bytes(path), path.name)
+
+        with mock.patch.object(Path, "read_bytes", tracked_read_bytes):
+            previous = None
+            for path, future in main.prefetch_files(self.paths, workers=2, max_bytes=2048):
+                if previous is not None:
+                    self.assertIn(previous, TrackedBytes.freed)
+                data, _ = future.result()
+                del future, data
+                previous = path.name
+
+    def test_missing_file_raises_from_its_future(self) -> None:
+        self.paths[5].unlink()
+        for path, future in main.prefetch_files(self.paths, workers=3, max_bytes=2048):
+            if path == self.paths[5]:
+                with self.assertRaises(FileNotFoundError):
+                    future.result()
+                break
+            future.result()
+
+
+if __name__ == "__main__":
+    unittest.main()